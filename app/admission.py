@@ -0,0 +1,157 @@
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import openai
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Provider/LiteLLM errors (rate limits, exhausted quota, upstream failures) all derive from this
+LLM_ERRORS = (openai.OpenAIError,)
+
+class OverloadedError(Exception):
+    """
+    Raised when a limiter sheds load: the queue is full, the queue deadline
+    passed, or an admitted call overran its timeout. `retry_after` is a
+    hint in seconds for the Retry-After header.
+    """
+
+    def __init__(self, name: str, reason: str, retry_after: float):
+        super().__init__(f"{name} is overloaded: {reason}")
+        self.retry_after = retry_after
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Per-endpoint admission control with an AIMD concurrency limit.
+
+    Requests above the current limit wait in a bounded FIFO queue for at most
+    `queue_timeout` seconds. Every completed call feeds its latency back:
+    fast successes grow the limit additively, slow calls or failures shrink
+    it multiplicatively, so the limit tracks what the backend can sustain.
+
+    Blocking calls run on a dedicated pool sized to `max_limit`, and a slot is
+    only released once its worker thread finishes, even if the caller has
+    already given up on it.
+    """
+
+    def __init__(self, name: str, initial_limit: int = 4, min_limit: int = 1,
+                 max_limit: int = 32, max_queue: int = 16, queue_timeout: float = 2.0,
+                 latency_target: float = 5.0, backoff: float = 0.75,
+                 failure_errors: tuple = (Exception,)):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.failure_errors = failure_errors
+        self._limit = float(initial_limit)
+        self._inflight = 0
+        self._waiters = deque()
+        self._executor = ThreadPoolExecutor(max_workers=max_limit, thread_name_prefix=f"{name}-limiter")
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _wake(self):
+        # Hand freed slots to queued requests in arrival order
+        while self._waiters and self._inflight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._inflight += 1
+                waiter.set_result(None)
+
+    async def acquire(self):
+        if self._inflight < self.limit and not self._waiters:
+            self._inflight += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            raise OverloadedError(self.name, "queue is full", self.queue_timeout)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over as we gave up; keep it on timeout, return it otherwise
+                if isinstance(e, asyncio.TimeoutError):
+                    return
+                self._inflight -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                raise OverloadedError(self.name, "queue deadline exceeded", self.queue_timeout)
+            raise
+
+    def release(self, latency: float, success: bool = True, adjust: bool = True):
+        self._inflight -= 1
+        if adjust and success and latency <= self.latency_target:
+            # Additive increase: roughly +1 once a full window of calls succeeds
+            self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+        elif adjust:
+            self._limit = max(self.min_limit, self._limit * self.backoff)
+        self._wake()
+
+    async def call(self, fn, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        Run blocking `fn` in a worker thread while holding one slot.
+
+        Raises OverloadedError if no slot frees up before the queue deadline or
+        the call exceeds `timeout`. A timed-out call keeps its slot until the
+        thread returns, and counts as a failure for the limit.
+        """
+        await self.acquire()
+        state = {"started": None, "timed_out": False}
+
+        def run():
+            state["started"] = time.monotonic()
+            return fn(*args, **kwargs)
+
+        def on_done(future):
+            latency = time.monotonic() - (state["started"] or time.monotonic())
+            error = None if future.cancelled() else future.exception()
+            if error is not None and not isinstance(error, self.failure_errors):
+                # Not a backend signal (e.g. a bug in our code): free the slot, keep the limit
+                self.release(latency, adjust=False)
+            else:
+                self.release(latency, success=error is None and not state["timed_out"])
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._executor, run)
+        except BaseException:
+            self.release(0.0, adjust=False)
+            raise
+        future.add_done_callback(on_done)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            state["timed_out"] = True
+            # The timed-out call still holds its slot, so retrying before another
+            # full call window has passed would most likely queue behind it
+            raise OverloadedError(self.name, "LLM call timed out", timeout)
+
+def _limiter_from_env(name: str, prefix: str) -> AdaptiveConcurrencyLimiter:
+    return AdaptiveConcurrencyLimiter(
+        name=name,
+        initial_limit=int(os.getenv(f"{prefix}_INITIAL_LIMIT", "4")),
+        max_limit=int(os.getenv(f"{prefix}_MAX_LIMIT", "32")),
+        max_queue=int(os.getenv(f"{prefix}_MAX_QUEUE", "16")),
+        queue_timeout=float(os.getenv(f"{prefix}_QUEUE_TIMEOUT", "2.0")),
+        latency_target=float(os.getenv(f"{prefix}_LATENCY_TARGET", "5.0")),
+        failure_errors=LLM_ERRORS,
+    )
+
+# Gemini call budget, deadline for a single LLM call once admitted
+LLM_CALL_TIMEOUT = float(os.getenv("LLM_CALL_TIMEOUT", "15.0"))
+
+query_limiter = _limiter_from_env("query", "QUERY")
+rerank_limiter = _limiter_from_env("rerank", "RERANK")
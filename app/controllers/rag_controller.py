@@ -1,7 +1,10 @@
 import dspy
+from typing import List, Optional
 from config.geminiConfig import gemini_flash, gemini_embeddings
 from config.qdrantConfig import qdrant_client_wrapper
-from app.schemas import QueryRequest, QueryResponse
+from app.schemas import QueryRequest, QueryResponse, SearchResponse, ProductHit
+from app.projection import payload_selector
+from app.admission import query_limiter, LLM_CALL_TIMEOUT
 
 # Simple DSPY Signature
 class GenerateAnswer(dspy.Signature):
@@ -13,9 +16,9 @@ async def process_query_logic(request: QueryRequest) -> QueryResponse:
     # Create DSPY module for generation
     generator = dspy.ChainOfThought(GenerateAnswer)
     
-    # Generate response
+    # Generate response off the event loop, behind admission control
     # Note: Temperature is currently using the global default from config
-    result = generator(question=request.query)
+    result = await query_limiter.call(generator, question=request.query, timeout=LLM_CALL_TIMEOUT)
     
     return QueryResponse(
         query=request.query,
@@ -23,7 +26,7 @@ async def process_query_logic(request: QueryRequest) -> QueryResponse:
         model=gemini_flash.lm.model
     )
 
-async def search_products_logic(query: str):
+async def search_products_logic(query: str, fields: Optional[List[str]] = None) -> SearchResponse:
     # Generate embedding for the query
     query_vector = gemini_embeddings.get_embeddings(query)
     
@@ -31,10 +34,15 @@ async def search_products_logic(query: str):
     search_result = qdrant_client_wrapper.client.search(
         collection_name="product_embeddings",
         query_vector=query_vector,
-        limit=5
+        limit=5,
+        with_payload=payload_selector(fields),
+        with_vectors=False
     )
     
-    return {"results": search_result}
+    return SearchResponse(results=[
+        ProductHit(id=hit.id, score=hit.score, payload=hit.payload or {})
+        for hit in search_result
+    ])
 
 async def check_db_status_logic():
     is_connected = qdrant_client_wrapper.check_connection()
@@ -1,7 +1,13 @@
 from config.qdrantConfig import qdrant_client_wrapper
-from app.schemas import RecommendationResponse, GeneratorRequest, GeneratorResponse
+from app.schemas import RecommendationResponse, GeneratorRequest, GeneratorResponse, ProductHit
+from app.projection import payload_selector, project_payload
+from app.admission import rerank_limiter, OverloadedError, LLM_ERRORS, LLM_CALL_TIMEOUT
+from typing import List, Optional
 import dspy
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 # class ReRankSignature(dspy.Signature):
 #     """
@@ -125,7 +131,7 @@ async def get_product_embedding(product_id: int):
     except Exception as e:
         raise ValueError(f"Error retrieving product {product_id}: {e}")
 
-async def get_recommendations_logic(product_id: int, total_recommendations: int = 5) -> RecommendationResponse:
+async def get_recommendations_logic(product_id: int, total_recommendations: int = 5, fields: Optional[List[str]] = None) -> RecommendationResponse:
     # 1. Get the product embedding
     vector, payload = await get_product_embedding(product_id)
     
@@ -134,12 +140,13 @@ async def get_recommendations_logic(product_id: int, total_recommendations: int
         collection_name="product_data",
         query=vector,
         limit=total_recommendations,
-        with_payload=True
+        with_payload=payload_selector(fields),
+        with_vectors=False
     ).points
     
     # Filter out the product itself if it appears in results (optional but good practice)
     recommendations = [
-        {"id": hit.id, "score": hit.score, "payload": hit.payload}
+        ProductHit(id=hit.id, score=hit.score, payload=hit.payload or {})
         for hit in search_result
         if hit.id != product_id
     ]
@@ -149,14 +156,32 @@ async def get_recommendations_logic(product_id: int, total_recommendations: int
         recommendations=recommendations
     )
 
-async def generate_recommendations_logic(request: GeneratorRequest) -> GeneratorResponse:
+def _project_hits(hits: List[ProductHit], fields: Optional[List[str]]) -> List[ProductHit]:
+    """Apply field projection to already-retrieved hits"""
+    if not fields:
+        return hits
+    return [
+        ProductHit(id=hit.id, score=hit.score, payload=project_payload(hit.payload, fields))
+        for hit in hits
+    ]
+
+def _vector_ranked_response(product_id: int, candidates: List[ProductHit], note: str, fields: Optional[List[str]] = None) -> GeneratorResponse:
+    """Degraded response: the vector-similarity order, flagged as not re-ranked"""
+    return GeneratorResponse(
+        product_id=product_id,
+        reranked_recommendations=_project_hits(candidates, fields),
+        reasoning=f"{note} Returning vector-ranked results.",
+        reranked=False
+    )
+
+async def generate_recommendations_logic(request: GeneratorRequest, fields: Optional[List[str]] = None) -> GeneratorResponse:
     # 1. Get current product details (for context)
     _, current_product_payload = await get_product_embedding(request.product_id)
     
     # Extract category
     category_name = "Honda Portable Generator"
     
-    # 2. Get base recommendations
+    # 2. Get base recommendations (full payloads, the re-ranker needs them as context)
     base_recs_response = await get_recommendations_logic(request.product_id, total_recommendations=request.total_recommendations or 5)
     candidates = base_recs_response.recommendations
     
@@ -165,13 +190,21 @@ async def generate_recommendations_logic(request: GeneratorRequest) -> Generator
     
     # Convert to strings for LLM
     current_product_str = json.dumps(current_product_payload, default=str)
-    candidates_str = json.dumps(candidates, default=str)
+    candidates_str = json.dumps([item.model_dump() for item in candidates], default=str)
     
-    prediction = reranker(
-        anchor_product=current_product_str,
-        category=category_name,
-        candidate_products=candidates_str
-    )
+    try:
+        prediction = await rerank_limiter.call(
+            reranker,
+            anchor_product=current_product_str,
+            category=category_name,
+            candidate_products=candidates_str,
+            timeout=LLM_CALL_TIMEOUT
+        )
+    except OverloadedError as e:
+        return _vector_ranked_response(request.product_id, candidates, f"Re-ranking skipped ({e}).", fields)
+    except LLM_ERRORS:
+        logger.exception("Re-ranking LLM call failed for product %s", request.product_id)
+        return _vector_ranked_response(request.product_id, candidates, "Re-ranking skipped (LLM error).", fields)
     
     # 4. Parse the result
     try:
@@ -181,7 +214,7 @@ async def generate_recommendations_logic(request: GeneratorRequest) -> Generator
         
         # Reconstruct the list of objects based on the returned IDs
         # Create a mapping for quick lookup
-        candidate_map = {item['id']: item for item in candidates}
+        candidate_map = {item.id: item for item in candidates}
         
         reranked_list = []
         for pid in ranked_ids:
@@ -191,33 +224,38 @@ async def generate_recommendations_logic(request: GeneratorRequest) -> Generator
                 reranked_list.append(candidate_map[pid_int])
         
         # Add any missing candidates that were dropped (Output Integrity guardrail fallback)
-        existing_ids = set(item['id'] for item in reranked_list)
+        existing_ids = set(item.id for item in reranked_list)
         for item in candidates:
-            if item['id'] not in existing_ids:
+            if item.id not in existing_ids:
                 reranked_list.append(item)
                 
     except (json.JSONDecodeError, AttributeError, ValueError):
-        # Fallback: if parsing fails, return original list but with a note in reasoning
-        reranked_list = candidates
-        prediction.reasoning += " (Failed to parse re-ranked list, returning original)"
+        # Fallback: if parsing fails, return the vector ranking flagged as not re-ranked
+        reasoning_text = getattr(prediction, 'reasoning', "No reasoning provided.")
+        return _vector_ranked_response(
+            request.product_id,
+            candidates,
+            f"{reasoning_text} (Failed to parse re-ranked list.)",
+            fields
+        )
 
     # Ensure reasoning is available (ChainOfThought adds it to prediction)
     reasoning_text = getattr(prediction, 'reasoning', "No reasoning provided.")
 
     return GeneratorResponse(
         product_id=request.product_id,
-        reranked_recommendations=reranked_list,
+        reranked_recommendations=_project_hits(reranked_list, fields),
         reasoning=reasoning_text
     )
 
-async def get_product_details_logic(product_id: int):
+async def get_product_details_logic(product_id: int, fields: Optional[List[str]] = None):
     """Retrieve just the product payload for details view"""
     try:
         result = qdrant_client_wrapper.client.retrieve(
             collection_name="product_data",
             ids=[product_id],
             with_vectors=False,
-            with_payload=True
+            with_payload=payload_selector(fields)
         )
         
         if not result:
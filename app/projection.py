@@ -0,0 +1,20 @@
+from typing import Any, Dict, List, Optional, Union
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a `fields=a,b,c` query parameter into payload keys (None means all fields)."""
+    if not fields:
+        return None
+    keys = [key.strip() for key in fields.split(",") if key.strip()]
+    return keys or None
+
+def payload_selector(fields: Optional[List[str]]) -> Union[bool, List[str]]:
+    """Qdrant `with_payload` value, so unused payload keys never leave the database."""
+    return fields if fields else True
+
+def project_payload(payload: Optional[Dict[str, Any]], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Keep only the requested payload keys."""
+    if not payload:
+        return {}
+    if not fields:
+        return payload
+    return {key: payload[key] for key in fields if key in payload}
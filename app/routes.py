@@ -1,11 +1,16 @@
-from fastapi import APIRouter, HTTPException
-from app.schemas import QueryRequest, QueryResponse, EmbeddingRequest, EmbeddingResponse, RecommendationResponse, GeneratorRequest, GeneratorResponse
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from app.schemas import QueryRequest, QueryResponse, EmbeddingRequest, EmbeddingResponse, RecommendationResponse, GeneratorRequest, GeneratorResponse, SearchResponse
+from app.projection import parse_fields
 from app.controllers.rag_controller import process_query_logic, search_products_logic, check_db_status_logic
 from app.controllers.embedding_controller import generate_embeddings_logic, get_config_info_logic
 from app.controllers.recommendation_controller import get_recommendations_logic, generate_recommendations_logic, get_product_details_logic
+from app.admission import OverloadedError
 
 router = APIRouter()
 
+FIELDS_DESCRIPTION = "Comma-separated payload keys to return, e.g. pc_item_display_name,pc_item_fob_price (default: all)"
+
 @router.post("/query", response_model=QueryResponse)
 async def process_query(request: QueryRequest):
     """
@@ -13,6 +18,12 @@ async def process_query(request: QueryRequest):
     """
     try:
         return await process_query_logic(request)
+    except OverloadedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after) or 1)}
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -45,13 +56,13 @@ async def get_config_info():
             detail=f"Error getting config: {str(e)}"
         )
 
-@router.get("/search")
-async def search_products(query: str):
+@router.get("/search", response_model=SearchResponse)
+async def search_products(query: str, fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)):
     """
     Search for products using RAG retrieval on product_embeddings collection.
     """
     try:
-        return await search_products_logic(query)
+        return await search_products_logic(query, parse_fields(fields))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -66,24 +77,24 @@ async def check_db_status():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/recommendations/{product_id}", response_model=RecommendationResponse)
-async def get_recommendations(product_id: int, total_recommendations: int = 5):
+async def get_recommendations(product_id: int, total_recommendations: int = 5, fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)):
     """
     Get recommendations for a specific product based on its embedding.
     """
     try:
-        return await get_recommendations_logic(product_id, total_recommendations)
+        return await get_recommendations_logic(product_id, total_recommendations, parse_fields(fields))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/recommendations/generate", response_model=GeneratorResponse)
-async def generate_recommendations(request: GeneratorRequest):
+async def generate_recommendations(request: GeneratorRequest, fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)):
     """
     Generate re-ranked recommendations based on a system prompt.
     """
     try:
-        return await generate_recommendations_logic(request)
+        return await generate_recommendations_logic(request, parse_fields(fields))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -93,12 +104,12 @@ async def generate_recommendations(request: GeneratorRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/product/{product_id}")
-async def get_product_details(product_id: int):
+async def get_product_details(product_id: int, fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)):
     """
     Get details for a specific product.
     """
     try:
-        return await get_product_details_logic(product_id)
+        return await get_product_details_logic(product_id, parse_fields(fields))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Any, Dict, List, Optional, Union
 
 class QueryRequest(BaseModel):
     """Request model for query endpoint."""
@@ -22,10 +22,20 @@ class EmbeddingResponse(BaseModel):
     embedding: List[float]
     model: str
 
+class ProductHit(BaseModel):
+    """Slim product result: point ID, similarity score and (optionally projected) payload."""
+    id: Union[int, str]
+    score: Optional[float] = None
+    payload: Dict[str, Any] = Field(default_factory=dict)
+
+class SearchResponse(BaseModel):
+    """Response model for search endpoint."""
+    results: List[ProductHit]
+
 class RecommendationResponse(BaseModel):
     """Response model for recommendation endpoint."""
     product_id: int
-    recommendations: List[dict]
+    recommendations: List[ProductHit]
 
 class GeneratorRequest(BaseModel):
     """Request model for generator endpoint."""
@@ -35,6 +45,7 @@ class GeneratorRequest(BaseModel):
 class GeneratorResponse(BaseModel):
     """Response model for generator endpoint."""
     product_id: int
-    reranked_recommendations: List[dict]
+    reranked_recommendations: List[ProductHit]
     reasoning: str
+    reranked: bool = Field(True, description="False when LLM re-ranking was skipped and the vector ranking is returned")
 
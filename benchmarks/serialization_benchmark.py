@@ -0,0 +1,151 @@
+"""
+Serialization cost of recommendation payloads, before and after slim models.
+
+Run from the repository root:
+    python -m benchmarks.serialization_benchmark --k 50 --iterations 200
+
+"after" is the real application (`main.app`: router, controllers, response
+models and GZip middleware) driven through `TestClient`. Only the Qdrant client
+and the query embedding call are stubbed, so no Qdrant or Gemini access is
+needed. "before" is a small app reproducing the baseline endpoints: `/search`
+returned raw `ScoredPoint` objects and `/recommendations` used a `List[dict]`
+response model, both rendered by JSONResponse without compression.
+
+The stub returns `ScoredPoint` objects shaped like `product_data` points
+(large `specs_json`). Every timing includes the same in-process TestClient
+round trip, so compare rows against each other rather than reading them as
+absolute server cost.
+"""
+import argparse
+import json
+import random
+import time
+from types import SimpleNamespace
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from qdrant_client.models import Record, ScoredPoint
+
+from config.geminiConfig import gemini_embeddings
+from config.qdrantConfig import qdrant_client_wrapper
+from main import app
+
+class LegacyRecommendationResponse(BaseModel):
+    """The previous response model: raw payload dicts."""
+    product_id: int
+    recommendations: List[dict]
+
+CARD_FIELDS = "pc_item_id,pc_item_display_name,pc_item_img_original,pc_item_fob_price"
+
+def make_point(i: int, n_specs: int, with_vector: bool) -> ScoredPoint:
+    specs = {f"Spec {s}": f"value {random.random():.6f} " * 4 for s in range(n_specs)}
+    return ScoredPoint(
+        id=100000 + i,
+        version=1,
+        score=random.random(),
+        payload={
+            "pc_item_id": 100000 + i,
+            "pc_item_display_name": f"Honda Portable Generator EU{i}i",
+            "pc_item_img_original": f"https://example.com/images/{i}.jpg",
+            "pc_item_fob_price": f"Rs {random.randint(10000, 90000)}",
+            "specs_json": json.dumps(specs),
+            "description": "Lorem ipsum dolor sit amet. " * 20,
+        },
+        vector=[random.random() for _ in range(768)] if with_vector else None,
+    )
+
+class StubQdrant:
+    """Returns fixed points, applying `with_payload`/`with_vectors` like Qdrant does."""
+
+    def __init__(self, points: List[ScoredPoint]):
+        self.points = points
+
+    def _select(self, with_payload=True, with_vectors=False) -> List[ScoredPoint]:
+        update = {}
+        if not with_vectors:
+            update["vector"] = None
+        points = self.points
+        if with_payload is not True:
+            points = [
+                point.model_copy(update={"payload": {key: point.payload[key] for key in with_payload if key in point.payload}})
+                for point in points
+            ]
+        return [point.model_copy(update=update) for point in points] if update else points
+
+    def search(self, collection_name=None, query_vector=None, limit=10, with_payload=True, with_vectors=False):
+        return self._select(with_payload, with_vectors)[:limit]
+
+    def query_points(self, collection_name=None, query=None, limit=10, with_payload=True, with_vectors=False):
+        return SimpleNamespace(points=self._select(with_payload, with_vectors)[:limit])
+
+    def retrieve(self, collection_name=None, ids=(), with_vectors=False, with_payload=True):
+        anchor = self.points[0]
+        return [Record(id=ids[0], payload=anchor.payload, vector=[0.0] * 768 if with_vectors else None)]
+
+def before_app(qdrant: StubQdrant) -> FastAPI:
+    legacy = FastAPI()
+
+    @legacy.get("/search")
+    async def search(query: str):
+        return {"results": qdrant.search(limit=5)}
+
+    @legacy.get("/recommendations/{product_id}", response_model=LegacyRecommendationResponse)
+    async def recommendations(product_id: int, total_recommendations: int = 5):
+        qdrant.retrieve(ids=[product_id], with_vectors=True)
+        hits = [
+            {"id": hit.id, "score": hit.score, "payload": hit.payload}
+            for hit in qdrant.query_points(limit=total_recommendations, with_payload=True).points
+        ]
+        return LegacyRecommendationResponse(product_id=product_id, recommendations=hits)
+
+    return legacy
+
+def time_requests(client: TestClient, url: str, encoding: str, iterations: int) -> float:
+    headers = {"Accept-Encoding": encoding}
+    start = time.perf_counter()
+    for _ in range(iterations):
+        client.get(url, headers=headers)
+    return (time.perf_counter() - start) / iterations * 1e3
+
+def bench(label: str, client: TestClient, url: str, iterations: int):
+    sizes = {}
+    for encoding in ("identity", "gzip"):
+        response = client.get(url, headers={"Accept-Encoding": encoding})
+        response.raise_for_status()
+        sizes[encoding] = int(response.headers.get("content-length", len(response.content)))
+
+    # identity isolates serialization; gzip adds the compression the app negotiates
+    plain = time_requests(client, url, "identity", iterations)
+    gzipped = time_requests(client, url, "gzip", iterations)
+    print(f"{label:<36} {plain:>8.2f} ms {gzipped:>8.2f} ms {sizes['identity']:>9} B {sizes['gzip']:>8} B")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--k", type=int, default=50, help="Recommendations per response")
+    parser.add_argument("--specs", type=int, default=40, help="Entries in each specs_json")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--with-vectors", action="store_true", help="Include 768-d vectors in the stubbed points")
+    args = parser.parse_args()
+
+    random.seed(0)
+    qdrant = StubQdrant([make_point(i, args.specs, args.with_vectors) for i in range(args.k)])
+    qdrant_client_wrapper.client = qdrant
+    gemini_embeddings.get_embeddings = lambda text: [0.0] * 768
+
+    before = TestClient(before_app(qdrant))
+    after = TestClient(app)
+    recs = f"/recommendations/1?total_recommendations={args.k}"
+
+    print(f"k={args.k} specs={args.specs} vectors={args.with_vectors} iterations={args.iterations}")
+    print(f"{'case':<36} {'ms plain':>11} {'ms gzip':>11} {'B plain':>11} {'B gzip':>10}")
+    bench("before /search (ScoredPoint)", before, "/search?query=x", args.iterations)
+    bench("after  /search", after, "/search?query=x", args.iterations)
+    bench("after  /search ?fields=", after, f"/search?query=x&fields={CARD_FIELDS}", args.iterations)
+    bench("before /recommendations (List[dict])", before, recs, args.iterations)
+    bench("after  /recommendations", after, recs, args.iterations)
+    bench("after  /recommendations ?fields=", after, f"{recs}&fields={CARD_FIELDS}", args.iterations)
+
+if __name__ == "__main__":
+    main()
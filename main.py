@@ -1,5 +1,6 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 from app.routes import router
 import config.geminiConfig
 
@@ -17,6 +18,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Compress large recommendation lists; level 5 keeps CPU well below serialization cost
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
+
 # Include routers
 app.include_router(router)
 
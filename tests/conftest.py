@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from qdrant_client.models import Record, ScoredPoint
+
+from config.qdrantConfig import qdrant_client_wrapper
+
+class FakeQdrant:
+    """In-memory stand-in for QdrantClient that records the kwargs of each call."""
+
+    def __init__(self, points):
+        self.points = points
+        self.calls = []
+
+    def _payload(self, payload, with_payload):
+        if with_payload is True:
+            return payload
+        return {key: payload[key] for key in with_payload if key in payload}
+
+    def retrieve(self, collection_name, ids, with_vectors=False, with_payload=True):
+        self.calls.append(("retrieve", {"ids": ids, "with_vectors": with_vectors, "with_payload": with_payload}))
+        return [
+            Record(id=point.id, payload=self._payload(point.payload, with_payload),
+                   vector=[0.1, 0.2] if with_vectors else None)
+            for point in self.points
+            if point.id in ids
+        ]
+
+    def _scored(self, with_payload, with_vectors):
+        return [
+            ScoredPoint(id=point.id, version=1, score=point.score,
+                        payload=self._payload(point.payload, with_payload),
+                        vector=[0.1, 0.2] if with_vectors else None)
+            for point in self.points
+        ]
+
+    def query_points(self, collection_name, query, limit, with_payload=True, with_vectors=False):
+        self.calls.append(("query_points", {"with_payload": with_payload, "with_vectors": with_vectors}))
+        return SimpleNamespace(points=self._scored(with_payload, with_vectors)[:limit])
+
+    def search(self, collection_name, query_vector, limit, with_payload=True, with_vectors=False):
+        self.calls.append(("search", {"with_payload": with_payload, "with_vectors": with_vectors}))
+        return self._scored(with_payload, with_vectors)[:limit]
+
+def make_points():
+    return [
+        SimpleNamespace(id=pid, score=1.0 - pid / 10, payload={
+            "pc_item_id": pid,
+            "pc_item_display_name": f"Generator {pid}",
+            "specs_json": '{"Power": "2 kW"}',
+        })
+        for pid in range(1, 5)
+    ]
+
+@pytest.fixture
+def qdrant(monkeypatch):
+    fake = FakeQdrant(make_points())
+    monkeypatch.setattr(qdrant_client_wrapper, "client", fake)
+    return fake
+
+@pytest.fixture
+def client():
+    from main import app
+    return TestClient(app)
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.admission import AdaptiveConcurrencyLimiter, OverloadedError
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_queued_requests_are_admitted_in_fifo_order():
+    async def scenario():
+        limiter = AdaptiveConcurrencyLimiter("t", initial_limit=1, max_queue=8, queue_timeout=1.0)
+        order = []
+
+        async def worker(i):
+            await limiter.acquire()
+            order.append(i)
+            await asyncio.sleep(0)
+            limiter.release(0.0)
+
+        await limiter.acquire()
+        tasks = [asyncio.create_task(worker(i)) for i in range(4)]
+        await asyncio.sleep(0)
+        assert len(limiter._waiters) == 4
+        limiter.release(0.0)
+        await asyncio.gather(*tasks)
+        assert order == [0, 1, 2, 3]
+        assert limiter._inflight == 0 and not limiter._waiters
+
+    run(scenario())
+
+def test_full_queue_is_rejected_immediately():
+    async def scenario():
+        limiter = AdaptiveConcurrencyLimiter("t", initial_limit=1, max_queue=1, queue_timeout=1.0)
+        await limiter.acquire()
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(OverloadedError, match="queue is full"):
+            await limiter.acquire()
+
+        limiter.release(0.0)
+        await queued
+        limiter.release(0.0)
+        assert limiter._inflight == 0 and not limiter._waiters
+
+    run(scenario())
+
+def test_queue_deadline_rejects_and_cleans_up():
+    async def scenario():
+        limiter = AdaptiveConcurrencyLimiter("t", initial_limit=1, queue_timeout=0.05)
+        await limiter.acquire()
+
+        with pytest.raises(OverloadedError, match="deadline") as exc_info:
+            await limiter.acquire()
+
+        assert exc_info.value.retry_after == 0.05
+        assert not limiter._waiters
+        limiter.release(0.0)
+        assert limiter._inflight == 0
+
+    run(scenario())
+
+def test_cancelled_waiter_leaves_no_state_behind():
+    async def scenario():
+        limiter = AdaptiveConcurrencyLimiter("t", initial_limit=1, queue_timeout=1.0)
+        await limiter.acquire()
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert len(limiter._waiters) == 1
+
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        assert not limiter._waiters
+        limiter.release(0.0)
+        assert limiter._inflight == 0
+
+    run(scenario())
+
+def test_limit_grows_additively_up_to_max():
+    limiter = AdaptiveConcurrencyLimiter("t", initial_limit=2, max_limit=4, latency_target=1.0)
+    limiter._inflight = 1
+    limiter.release(0.1)
+    assert limiter._limit == pytest.approx(2.5)
+
+    for _ in range(100):
+        limiter._inflight = 1
+        limiter.release(0.1)
+    assert limiter.limit == 4
+
+def test_slow_or_failed_calls_back_off_down_to_min():
+    limiter = AdaptiveConcurrencyLimiter("t", initial_limit=8, min_limit=2, latency_target=1.0, backoff=0.5)
+    limiter._inflight = 1
+    limiter.release(5.0)
+    assert limiter.limit == 4
+    limiter._inflight = 1
+    limiter.release(0.1, success=False)
+    assert limiter.limit == 2
+
+    for _ in range(10):
+        limiter._inflight = 1
+        limiter.release(5.0)
+    assert limiter.limit == 2
+
+def test_timed_out_call_holds_its_slot_until_the_thread_finishes():
+    async def scenario():
+        limiter = AdaptiveConcurrencyLimiter("t", initial_limit=1, queue_timeout=0.05, latency_target=10.0)
+        finish = threading.Event()
+
+        with pytest.raises(OverloadedError, match="timed out") as exc_info:
+            await limiter.call(finish.wait, timeout=0.05)
+        assert exc_info.value.retry_after == 0.05
+        assert limiter._inflight == 1
+
+        # The orphaned thread still counts, so a new call cannot get in
+        with pytest.raises(OverloadedError, match="deadline"):
+            await limiter.call(lambda: None, timeout=1.0)
+
+        finish.set()
+        while limiter._inflight:
+            await asyncio.sleep(0.01)
+        assert limiter._limit == pytest.approx(1.0)
+        assert await limiter.call(lambda: "ok", timeout=1.0) == "ok"
+
+    run(scenario())
+
+def test_non_backend_errors_free_the_slot_without_adjusting_the_limit():
+    async def scenario():
+        limiter = AdaptiveConcurrencyLimiter("t", initial_limit=4, failure_errors=(ConnectionError,))
+
+        def broken():
+            raise TypeError("bug")
+
+        def upstream_down():
+            raise ConnectionError("provider")
+
+        with pytest.raises(TypeError):
+            await limiter.call(broken)
+        assert limiter._inflight == 0
+        assert limiter._limit == pytest.approx(4.0)
+
+        with pytest.raises(ConnectionError):
+            await limiter.call(upstream_down)
+        assert limiter._inflight == 0
+        assert limiter._limit == pytest.approx(3.0)
+
+    run(scenario())
@@ -0,0 +1,86 @@
+import dspy
+import openai
+import pytest
+
+from app.admission import OverloadedError, query_limiter, rerank_limiter
+
+GENERATE_BODY = {"product_id": 1, "total_recommendations": 5}
+VECTOR_ORDER = [2, 3, 4]
+
+def stub_call(monkeypatch, limiter, outcome):
+    async def call(fn, *args, timeout=None, **kwargs):
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+    monkeypatch.setattr(limiter, "call", call)
+
+def ids(hits):
+    return [hit["id"] for hit in hits]
+
+def test_generate_returns_reranked_list(monkeypatch, qdrant, client):
+    stub_call(monkeypatch, rerank_limiter, dspy.Prediction(ranked_product_ids="[4, 2, 3]", reasoning="closest first"))
+
+    response = client.post("/recommendations/generate", json=GENERATE_BODY)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["reranked"] is True
+    assert ids(body["reranked_recommendations"]) == [4, 2, 3]
+    assert body["reasoning"] == "closest first"
+
+@pytest.mark.parametrize("error", [
+    OverloadedError("rerank", "queue is full", 2.0),
+    OverloadedError("rerank", "LLM call timed out", 15.0),
+])
+def test_generate_degrades_to_vector_ranking_when_overloaded(monkeypatch, qdrant, client, error):
+    stub_call(monkeypatch, rerank_limiter, error)
+
+    response = client.post("/recommendations/generate", json=GENERATE_BODY)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["reranked"] is False
+    assert ids(body["reranked_recommendations"]) == VECTOR_ORDER
+    assert "overloaded" in body["reasoning"]
+
+def test_generate_degrades_on_llm_error_without_leaking_it(monkeypatch, qdrant, client):
+    stub_call(monkeypatch, rerank_limiter, openai.OpenAIError("quota exceeded for key sk-secret"))
+
+    response = client.post("/recommendations/generate", json=GENERATE_BODY)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["reranked"] is False
+    assert ids(body["reranked_recommendations"]) == VECTOR_ORDER
+    assert "LLM error" in body["reasoning"]
+    assert "sk-secret" not in body["reasoning"]
+
+def test_generate_flags_unparseable_llm_output_as_not_reranked(monkeypatch, qdrant, client):
+    stub_call(monkeypatch, rerank_limiter, dspy.Prediction(ranked_product_ids="not json", reasoning="hmm"))
+
+    response = client.post("/recommendations/generate", json=GENERATE_BODY)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["reranked"] is False
+    assert ids(body["reranked_recommendations"]) == VECTOR_ORDER
+
+def test_generate_does_not_hide_bugs_behind_the_fallback(monkeypatch, qdrant, client):
+    stub_call(monkeypatch, rerank_limiter, TypeError("bug"))
+
+    response = client.post("/recommendations/generate", json=GENERATE_BODY)
+
+    assert response.status_code == 500
+
+@pytest.mark.parametrize("error, retry_after", [
+    (OverloadedError("query", "queue deadline exceeded", 2.0), "2"),
+    (OverloadedError("query", "LLM call timed out", 15.0), "15"),
+])
+def test_query_sheds_load_with_503_and_retry_after(monkeypatch, client, error, retry_after):
+    stub_call(monkeypatch, query_limiter, error)
+
+    response = client.post("/query", json={"query": "best generator?"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == retry_after
+    assert "overloaded" in response.json()["detail"]
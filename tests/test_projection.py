@@ -0,0 +1,84 @@
+import dspy
+import pytest
+
+from app.admission import rerank_limiter
+from app.projection import parse_fields, payload_selector, project_payload
+from config.geminiConfig import gemini_embeddings
+
+@pytest.mark.parametrize("raw, expected", [
+    (None, None),
+    ("", None),
+    (",,", None),
+    (" , ", None),
+    ("pc_item_id", ["pc_item_id"]),
+    (" pc_item_id , specs_json ,", ["pc_item_id", "specs_json"]),
+])
+def test_parse_fields(raw, expected):
+    assert parse_fields(raw) == expected
+
+def test_payload_selector_passes_include_list_or_everything():
+    assert payload_selector(None) is True
+    assert payload_selector([]) is True
+    assert payload_selector(["pc_item_id"]) == ["pc_item_id"]
+
+def test_project_payload_keeps_requested_keys_only():
+    payload = {"pc_item_id": 1, "specs_json": "{}", "description": "long"}
+
+    assert project_payload(payload, ["pc_item_id", "missing"]) == {"pc_item_id": 1}
+    assert project_payload(payload, None) is payload
+    assert project_payload(None, ["pc_item_id"]) == {}
+
+@pytest.fixture
+def no_embeddings(monkeypatch):
+    monkeypatch.setattr(gemini_embeddings, "get_embeddings", lambda text: [0.0, 0.0])
+
+def test_search_returns_slim_product_hits(qdrant, client, no_embeddings):
+    response = client.get("/search", params={"query": "generator"})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [set(hit) for hit in results] == [{"id", "score", "payload"}] * len(results)
+    assert results[0]["payload"]["specs_json"] == '{"Power": "2 kW"}'
+    assert qdrant.calls[-1] == ("search", {"with_payload": True, "with_vectors": False})
+
+def test_search_fields_are_sent_to_qdrant(qdrant, client, no_embeddings):
+    response = client.get("/search", params={"query": "generator", "fields": "pc_item_id, pc_item_display_name"})
+
+    assert qdrant.calls[-1][1]["with_payload"] == ["pc_item_id", "pc_item_display_name"]
+    for hit in response.json()["results"]:
+        assert set(hit["payload"]) == {"pc_item_id", "pc_item_display_name"}
+
+def test_recommendations_fields_are_sent_to_qdrant(qdrant, client):
+    response = client.get("/recommendations/1", params={"fields": "pc_item_id"})
+
+    assert response.status_code == 200
+    assert qdrant.calls[-1] == ("query_points", {"with_payload": ["pc_item_id"], "with_vectors": False})
+    assert [hit["payload"] for hit in response.json()["recommendations"]] == [
+        {"pc_item_id": 2}, {"pc_item_id": 3}, {"pc_item_id": 4}
+    ]
+
+def test_product_details_fields(qdrant, client):
+    response = client.get("/product/2", params={"fields": "pc_item_display_name"})
+
+    assert response.status_code == 200
+    assert response.json() == {"pc_item_display_name": "Generator 2"}
+
+def test_generate_reranks_on_full_payloads_and_projects_output(monkeypatch, qdrant, client):
+    seen = {}
+
+    async def call(fn, *args, timeout=None, **kwargs):
+        seen.update(kwargs)
+        return dspy.Prediction(ranked_product_ids="[3, 2, 4]", reasoning="ok")
+    monkeypatch.setattr(rerank_limiter, "call", call)
+
+    response = client.post(
+        "/recommendations/generate",
+        params={"fields": "pc_item_id"},
+        json={"product_id": 1, "total_recommendations": 5},
+    )
+
+    assert response.status_code == 200
+    assert "specs_json" in seen["candidate_products"]
+    assert [hit["payload"] for hit in response.json()["reranked_recommendations"]] == [
+        {"pc_item_id": 3}, {"pc_item_id": 2}, {"pc_item_id": 4}
+    ]